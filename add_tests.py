@@ -1,5 +1,5 @@
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 from dotenv import load_dotenv
 import os
 
@@ -25,20 +25,34 @@ test_contacts = [
 
 print("Adding test contacts...")
 
+rows = [
+    (c["serial_number"], c["name"], c["email"], c["title"], c["company"])
+    for c in test_contacts
+]
+execute_values(
+    cur,
+    """INSERT INTO email_campaigns (serial_number, name, email, title, company, status, sent)
+       VALUES %s
+       ON CONFLICT (email) DO UPDATE SET 
+           status = 'pending', 
+           sent = FALSE,
+           name = EXCLUDED.name,
+           title = EXCLUDED.title,
+           company = EXCLUDED.company,
+           error_message = NULL,
+           sent_at = NULL
+       WHERE email_campaigns.status IS DISTINCT FROM 'pending'
+          OR email_campaigns.sent IS DISTINCT FROM FALSE
+          OR email_campaigns.name IS DISTINCT FROM EXCLUDED.name
+          OR email_campaigns.title IS DISTINCT FROM EXCLUDED.title
+          OR email_campaigns.company IS DISTINCT FROM EXCLUDED.company
+          OR email_campaigns.error_message IS NOT NULL
+          OR email_campaigns.sent_at IS NOT NULL""",
+    rows,
+    template="(%s, %s, %s, %s, %s, 'pending', FALSE)",
+    page_size=100
+)
 for contact in test_contacts:
-    cur.execute(
-        """INSERT INTO email_campaigns (serial_number, name, email, title, company, status, sent)
-           VALUES (%s, %s, %s, %s, %s, 'pending', FALSE)
-           ON CONFLICT (email) DO UPDATE SET 
-               status = 'pending', 
-               sent = FALSE,
-               name = EXCLUDED.name,
-               title = EXCLUDED.title,
-               company = EXCLUDED.company,
-               error_message = NULL,
-               sent_at = NULL""",
-        (contact["serial_number"], contact["name"], contact["email"], contact["title"], contact["company"])
-    )
     print(f"✅ Added/Updated: {contact['name']} ({contact['company']})")
 
 # Also reset old test contacts
@@ -46,6 +60,7 @@ cur.execute("""
     UPDATE email_campaigns 
     SET status = 'pending', sent = FALSE, error_message = NULL, sent_at = NULL
     WHERE email IN ('chiragj2019@gmail.com', 'cjshorts14@gmail.com')
+      AND (status IS DISTINCT FROM 'pending' OR sent IS DISTINCT FROM FALSE OR error_message IS NOT NULL OR sent_at IS NOT NULL)
 """)
 print(f"\n✅ Reset old test contacts")
 
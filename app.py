@@ -4,21 +4,29 @@ Streamlit Frontend + Synchronous Database (psycopg2) + All Services Combined
 """
 
 import os
+import json
 import random
 import smtplib
 import base64
 import threading
 import time
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.application import MIMEApplication
+from email.mime.base import MIMEBase
 from typing import Optional, List, Dict, Any
 from urllib.parse import urlparse
 
+import numpy as np
+import pandas as pd
 import streamlit as st
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
+from psycopg2.pool import ThreadedConnectionPool
 import google.generativeai as genai
 from dotenv import load_dotenv
 
@@ -43,6 +51,10 @@ class Config:
     RESUME_PATH = os.getenv("RESUME_PATH", "")
     MIN_DELAY = int(os.getenv("MIN_DELAY", "600"))  # 10 minutes
     MAX_DELAY = int(os.getenv("MAX_DELAY", "1800"))  # 30 minutes
+    SMTP_WORKERS = int(os.getenv("SMTP_WORKERS", "1"))  # Parallel campaign senders
+    SEND_POOL_WORKERS = 4  # Background threads for manual Custom Send
+    DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "10"))
+    GEMINI_PERSONALIZE = os.getenv("GEMINI_PERSONALIZE", "false").lower() in ("1", "true", "yes")
     
     # Applicant Profile for AI-generated emails
     APPLICANT_SKILLS = os.getenv("APPLICANT_SKILLS", "")
@@ -52,144 +64,264 @@ class Config:
 
 config = Config()
 
+# Mean of the random send delay, in minutes
+AVG_DELAY_MIN = (config.MIN_DELAY + config.MAX_DELAY) // 120
+
 # =============================================================================
 # DATABASE OPERATIONS (Synchronous with psycopg2)
 # =============================================================================
 
+# Schema bootstrap, sent as a single multi-statement simple query
+SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS email_campaigns (
+        id SERIAL PRIMARY KEY,
+        serial_number INT,
+        name TEXT NOT NULL,
+        email TEXT NOT NULL UNIQUE,
+        title TEXT,
+        company TEXT,
+        status TEXT DEFAULT 'pending',
+        sent BOOLEAN DEFAULT FALSE,
+        error_message TEXT,
+        sent_at TIMESTAMP,
+        created_at TIMESTAMP DEFAULT NOW(),
+        updated_at TIMESTAMP DEFAULT NOW()
+    );
+    
+    CREATE TABLE IF NOT EXISTS resume_storage (
+        id SERIAL PRIMARY KEY,
+        filename TEXT NOT NULL,
+        content_base64 TEXT NOT NULL,
+        content_type TEXT DEFAULT 'application/pdf',
+        uploaded_at TIMESTAMP DEFAULT NOW(),
+        is_active BOOLEAN DEFAULT TRUE
+    );
+    
+    -- Partial index for the failed list; pending rows use idx_campaigns_pending_sort below
+    CREATE INDEX IF NOT EXISTS idx_campaigns_status_failed
+    ON email_campaigns (updated_at DESC)
+    WHERE status = 'failed';
+    
+    -- One pending index for the worker queue (its sent = FALSE predicate implies this
+    -- one) and the UI lists; matches the Custom Send keyset order, where NULL serials
+    -- sort last as 2147483647 so the row comparison can reach them
+    CREATE INDEX IF NOT EXISTS idx_campaigns_pending_sort
+    ON email_campaigns ((COALESCE(serial_number, 2147483647)), id)
+    WHERE status = 'pending';
+    
+    -- Backs the UI list/count queries: status filter and test-first ordering
+    CREATE INDEX IF NOT EXISTS idx_campaigns_status_serial
+    ON email_campaigns (status, serial_number);
+"""
+
+# Optional trigram index for the ILIKE search; needs CREATE on the database and a
+# host that allows pg_trgm, so it runs separately and search works (unindexed) without it
+SEARCH_INDEX_SQL = """
+    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+    
+    CREATE INDEX IF NOT EXISTS idx_campaigns_search_trgm
+    ON email_campaigns USING gin ((name || ' ' || email || ' ' || COALESCE(company, '')) gin_trgm_ops);
+"""
+
+@st.cache_resource
+def get_db_pool() -> ThreadedConnectionPool:
+    """Create the thread-safe connection pool with SSL (once per server process)"""
+    # getconn() raises instead of blocking when exhausted, so leave room for every
+    # campaign sender and manual-send thread plus concurrent UI reruns
+    maxconn = max(config.DB_POOL_MAX, config.SMTP_WORKERS + config.SEND_POOL_WORKERS + 2)
+    # putconn() keeps at most minconn idle connections and closes the rest, so keep
+    # enough for every sending thread plus a UI rerun
+    minconn = config.SMTP_WORKERS + config.SEND_POOL_WORKERS + 1
+    pool = ThreadedConnectionPool(minconn, maxconn, **Database._parsed())
+    pool.last_used = {}  # id(conn) -> time.monotonic() when it was returned
+    return pool
+
 class Database:
-    _connection = None
+    _pool = None
+    _conn_kwargs = None
+    # Connections idle longer than this are pinged on checkout (Neon suspends idle compute)
+    IDLE_PING_SECONDS = 60
     
     @classmethod
-    def get_connection(cls):
-        """Get database connection with SSL"""
-        if cls._connection is None or cls._connection.closed:
-            db_url = config.DATABASE_URL
-            # Parse the URL and add sslmode
-            if "?" in db_url:
-                db_url = db_url.split("?")[0]
-            
-            # Parse connection string
+    def _parsed(cls) -> Dict[str, Any]:
+        """Parse DATABASE_URL into psycopg2 connect kwargs (once)"""
+        if cls._conn_kwargs is None:
+            # Drop the query string; sslmode is set explicitly
+            db_url = config.DATABASE_URL.split("?", 1)[0]
             parsed = urlparse(db_url)
-            
-            cls._connection = psycopg2.connect(
-                host=parsed.hostname,
-                port=parsed.port or 5432,
-                database=parsed.path[1:],  # Remove leading /
-                user=parsed.username,
-                password=parsed.password,
-                sslmode='require'
-            )
-            cls._connection.autocommit = True
-        return cls._connection
+            cls._conn_kwargs = {
+                "host": parsed.hostname,
+                "port": parsed.port or 5432,
+                "database": parsed.path[1:],  # Remove leading /
+                "user": parsed.username,
+                "password": parsed.password,
+                "sslmode": "require",
+                "keepalives": 1,
+                "keepalives_idle": 30,
+            }
+        return cls._conn_kwargs
+    
+    @classmethod
+    def get_pool(cls) -> ThreadedConnectionPool:
+        """Get the shared connection pool"""
+        if cls._pool is None:
+            cls._pool = get_db_pool()
+        return cls._pool
+    
+    @classmethod
+    def _checkout(cls, pool: ThreadedConnectionPool):
+        """Get a live pooled connection, replacing ones that died while idle"""
+        for _ in range(pool.maxconn):
+            conn = pool.getconn()
+            if not conn.closed:
+                idle = time.monotonic() - pool.last_used.get(id(conn), time.monotonic())
+                if idle < cls.IDLE_PING_SECONDS:
+                    return conn
+                try:
+                    conn.autocommit = True
+                    with conn.cursor() as cur:
+                        cur.execute("SELECT 1")
+                    return conn
+                except psycopg2.Error:
+                    pass
+            pool.last_used.pop(id(conn), None)
+            pool.putconn(conn, close=True)
+        return pool.getconn()
     
     @classmethod
-    def execute_query(cls, query: str, params: tuple = None, fetch: str = None):
-        """Execute a query and optionally fetch results"""
+    @contextmanager
+    def connection(cls):
+        """Borrow a connection from the pool; broken connections are discarded"""
+        pool = cls.get_pool()
+        conn = cls._checkout(pool)
+        broken = False
         try:
-            conn = cls.get_connection()
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(query, params)
-                if fetch == "one":
-                    return dict(cur.fetchone()) if cur.fetchone else None
-                elif fetch == "all":
-                    return [dict(row) for row in cur.fetchall()]
-                elif fetch == "val":
-                    result = cur.fetchone()
-                    return result[0] if result else None
-        except psycopg2.Error as e:
-            # Reconnect on connection error
-            cls._connection = None
-            conn = cls.get_connection()
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(query, params)
-                if fetch == "one":
-                    result = cur.fetchone()
-                    return dict(result) if result else None
-                elif fetch == "all":
-                    return [dict(row) for row in cur.fetchall()]
-                elif fetch == "val":
-                    result = cur.fetchone()
-                    return result[0] if result else None
+            conn.autocommit = True
+            yield conn
+        except psycopg2.Error:
+            broken = True
+            raise
+        finally:
+            pool.last_used[id(conn)] = time.monotonic()
+            pool.putconn(conn, close=broken)
+            if conn.closed:
+                # Broken, or surplus beyond minconn; only track connections the pool kept
+                pool.last_used.pop(id(conn), None)
     
     @classmethod
     def init_tables(cls):
-        """Initialize database tables"""
-        cls.execute_query("""
-            CREATE TABLE IF NOT EXISTS email_campaigns (
-                id SERIAL PRIMARY KEY,
-                serial_number INT,
-                name TEXT NOT NULL,
-                email TEXT NOT NULL UNIQUE,
-                title TEXT,
-                company TEXT,
-                status TEXT DEFAULT 'pending',
-                sent BOOLEAN DEFAULT FALSE,
-                error_message TEXT,
-                sent_at TIMESTAMP,
-                created_at TIMESTAMP DEFAULT NOW(),
-                updated_at TIMESTAMP DEFAULT NOW()
-            )
-        """)
-        cls.execute_query("""
-            CREATE TABLE IF NOT EXISTS resume_storage (
-                id SERIAL PRIMARY KEY,
-                filename TEXT NOT NULL,
-                content_base64 TEXT NOT NULL,
-                content_type TEXT DEFAULT 'application/pdf',
-                uploaded_at TIMESTAMP DEFAULT NOW(),
-                is_active BOOLEAN DEFAULT TRUE
+        """Initialize database tables (one round-trip for the whole schema)"""
+        with cls.connection() as conn, conn.cursor() as cur:
+            cur.execute(SCHEMA_SQL)
+        try:
+            with cls.connection() as conn, conn.cursor() as cur:
+                cur.execute(SEARCH_INDEX_SQL)
+        except psycopg2.Error as e:
+            print(f"Search index not created: {e}")
+    
+    @classmethod
+    def claim_next_pending(cls) -> Optional[Dict]:
+        """Atomically pick the next pending email and mark it as sending"""
+        # Plain tuple cursor: the worker only needs these five columns
+        with cls.connection() as conn, conn.cursor() as cur:
+            # SKIP LOCKED lets concurrent workers claim distinct rows
+            cur.execute(
+                """UPDATE email_campaigns 
+                   SET status = 'sending', updated_at = NOW() 
+                   WHERE id = (
+                       SELECT id FROM email_campaigns 
+                       WHERE status = 'pending' AND sent = FALSE 
+                       ORDER BY COALESCE(serial_number, 2147483647) ASC, id ASC 
+                       FOR UPDATE SKIP LOCKED LIMIT 1
+                   )
+                   RETURNING id, name, email, title, company"""
             )
-        """)
+            row = cur.fetchone()
+            if row is None:
+                return None
+            return {"id": row[0], "name": row[1], "email": row[2], "title": row[3], "company": row[4]}
+    
+    # Whitelisted ORDER BY clauses for query_emails
+    EMAIL_ORDERINGS = {
+        # Test rows (serial_number = 0) sort first, NULL serials last; also the keyset order for after=
+        "serial_number": "COALESCE(serial_number, 2147483647) ASC, id ASC",
+        "updated_at": "updated_at DESC",
+    }
+    
+    @staticmethod
+    def _email_filters(status: str, test_only: Optional[bool] = None, search: Optional[str] = None) -> tuple:
+        """Build the shared WHERE clause and params for query_emails/count_emails"""
+        clauses = ["status = %s"]
+        params = [status]
+        if test_only is True:
+            clauses.append("serial_number = 0")
+        elif test_only is False:
+            clauses.append("serial_number IS DISTINCT FROM 0")
+        if search:
+            # Same expression as idx_campaigns_search_trgm so ILIKE is index-backed
+            escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            clauses.append("(name || ' ' || email || ' ' || COALESCE(company, '')) ILIKE %s")
+            params.append(f"%{escaped}%")
+        return " AND ".join(clauses), params
     
     @classmethod
-    def get_pending_emails(cls, limit: int = 100) -> List[Dict]:
-        """Get pending emails"""
-        conn = cls.get_connection()
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+    def query_emails(cls, status: str, *, test_only: Optional[bool] = None, search: Optional[str] = None,
+                     order_by: str = "serial_number", limit: int = 100, offset: int = 0,
+                     after: Optional[tuple] = None) -> List[Dict]:
+        """Get a filtered, ordered page of emails (test_only=None for test and regular)"""
+        where, params = cls._email_filters(status, test_only, search)
+        if after is not None:
+            # Keyset: seek past the previous page's last (serial_number, id) via the index;
+            # a NULL in a row comparison yields NULL, so compare the coalesced sort key
+            where += " AND (COALESCE(serial_number, 2147483647), id) > (COALESCE(%s::int, 2147483647), %s)"
+            params.extend(after)
+        with cls.connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
             cur.execute(
-                """SELECT * FROM email_campaigns 
-                   WHERE status = 'pending' AND sent = FALSE 
-                   ORDER BY serial_number ASC LIMIT %s""",
-                (limit,)
+                f"""SELECT * FROM email_campaigns WHERE {where} 
+                    ORDER BY {cls.EMAIL_ORDERINGS[order_by]} 
+                    LIMIT %s OFFSET %s""",
+                (*params, limit, offset)
             )
             return [dict(row) for row in cur.fetchall()]
     
     @classmethod
-    def get_emails_by_status(cls, status: str) -> List[Dict]:
-        """Get emails by status"""
-        conn = cls.get_connection()
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+    def count_emails(cls, status: str, test_only: Optional[bool] = None, search: Optional[str] = None) -> int:
+        """Count emails matching the same filters as query_emails"""
+        where, params = cls._email_filters(status, test_only, search)
+        with cls.connection() as conn, conn.cursor() as cur:
+            cur.execute(f"SELECT COUNT(*) FROM email_campaigns WHERE {where}", params)
+            return cur.fetchone()[0]
+    
+    @classmethod
+    def claim_email(cls, email_id: int) -> bool:
+        """Mark one pending email as sending; False if someone else already has it"""
+        with cls.connection() as conn, conn.cursor() as cur:
             cur.execute(
-                """SELECT * FROM email_campaigns WHERE status = %s 
-                   ORDER BY updated_at DESC""",
-                (status,)
+                """UPDATE email_campaigns 
+                   SET status = 'sending', updated_at = NOW() 
+                   WHERE id = %s AND status = 'pending' AND sent = FALSE 
+                   RETURNING id""",
+                (email_id,)
             )
-            return [dict(row) for row in cur.fetchall()]
+            return cur.fetchone() is not None
     
     @classmethod
-    def get_stats(cls) -> Dict:
-        """Get campaign statistics"""
-        conn = cls.get_connection()
-        with conn.cursor() as cur:
-            cur.execute("SELECT COUNT(*) FROM email_campaigns")
-            total = cur.fetchone()[0]
-            
-            cur.execute("SELECT COUNT(*) FROM email_campaigns WHERE sent = TRUE")
-            sent = cur.fetchone()[0]
-            
-            cur.execute("SELECT COUNT(*) FROM email_campaigns WHERE status = 'pending' AND sent = FALSE")
-            pending = cur.fetchone()[0]
-            
-            cur.execute("SELECT COUNT(*) FROM email_campaigns WHERE status = 'failed'")
-            failed = cur.fetchone()[0]
-            
-        return {"total": total, "sent": sent, "pending": pending, "failed": failed}
+    def get_status_counts(cls) -> Dict[str, int]:
+        """Get campaign statistics as per-status counts in one round-trip"""
+        with cls.connection() as conn, conn.cursor() as cur:
+            cur.execute("SELECT status, COUNT(*) FROM email_campaigns GROUP BY status")
+            counts = dict(cur.fetchall())
+        return {
+            "total": sum(counts.values()),
+            "sent": counts.get("sent", 0),
+            "pending": counts.get("pending", 0),
+            "failed": counts.get("failed", 0),
+        }
     
     @classmethod
     def update_email_status(cls, email_id: int, status: str, error_message: str = None):
         """Update email status"""
-        conn = cls.get_connection()
-        with conn.cursor() as cur:
+        with cls.connection() as conn, conn.cursor() as cur:
             if status == "sent":
                 cur.execute(
                     """UPDATE email_campaigns 
@@ -205,11 +337,20 @@ class Database:
                     (status, error_message, email_id)
                 )
     
+    @classmethod
+    def fail_interrupted_sends(cls):
+        """Mark rows left in 'sending' by a crashed worker or restart as failed"""
+        with cls.connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                """UPDATE email_campaigns 
+                   SET status = 'failed', error_message = 'interrupted', updated_at = NOW() 
+                   WHERE status = 'sending'"""
+            )
+    
     @classmethod
     def reset_email_status(cls, email_id: int):
         """Reset email to pending"""
-        conn = cls.get_connection()
-        with conn.cursor() as cur:
+        with cls.connection() as conn, conn.cursor() as cur:
             cur.execute(
                 """UPDATE email_campaigns 
                    SET status = 'pending', sent = FALSE, error_message = NULL, updated_at = NOW() 
@@ -220,8 +361,7 @@ class Database:
     @classmethod
     def reset_all_failed(cls):
         """Reset all failed emails to pending"""
-        conn = cls.get_connection()
-        with conn.cursor() as cur:
+        with cls.connection() as conn, conn.cursor() as cur:
             cur.execute(
                 """UPDATE email_campaigns 
                    SET status = 'pending', sent = FALSE, error_message = NULL, updated_at = NOW() 
@@ -229,14 +369,24 @@ class Database:
             )
     
     @classmethod
-    def get_active_resume(cls) -> Optional[Dict]:
-        """Get active resume from database"""
-        conn = cls.get_connection()
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+    def get_active_resume_key(cls) -> Optional[tuple]:
+        """Get (id, uploaded_at) of the active resume without its content"""
+        with cls.connection() as conn, conn.cursor() as cur:
             cur.execute(
-                """SELECT * FROM resume_storage WHERE is_active = TRUE 
+                """SELECT id, uploaded_at FROM resume_storage WHERE is_active = TRUE 
                    ORDER BY uploaded_at DESC LIMIT 1"""
             )
+            return cur.fetchone()
+    
+    @classmethod
+    def get_resume_by_id(cls, resume_id: int) -> Optional[Dict]:
+        """Get a stored resume by ID"""
+        with cls.connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(
+                """SELECT filename, content_base64, content_type FROM resume_storage 
+                   WHERE id = %s""",
+                (resume_id,)
+            )
             row = cur.fetchone()
             return dict(row) if row else None
     
@@ -256,36 +406,47 @@ class Database:
             {"serial_number": 0, "name": "Kavita Joshi", "email": "chiragj2019+zomato@gmail.com", "title": "Recruitment Manager", "company": "Zomato"},
             {"serial_number": 0, "name": "Sanjay Mehta", "email": "chiragj2019+swiggy@gmail.com", "title": "HR Director", "company": "Swiggy"},
         ]
-        conn = cls.get_connection()
-        with conn.cursor() as cur:
-            for contact in test_contacts:
-                try:
-                    # Use UPSERT to reset status if contact already exists
-                    cur.execute(
-                        """INSERT INTO email_campaigns (serial_number, name, email, title, company, status, sent)
-                           VALUES (%s, %s, %s, %s, %s, 'pending', FALSE)
-                           ON CONFLICT (email) DO UPDATE SET 
-                               status = 'pending', 
-                               sent = FALSE,
-                               name = EXCLUDED.name,
-                               title = EXCLUDED.title,
-                               company = EXCLUDED.company,
-                               error_message = NULL,
-                               sent_at = NULL""",
-                        (contact["serial_number"], contact["name"], contact["email"], contact["title"], contact["company"])
-                    )
-                except Exception as e:
-                    print(f"Error adding test contact: {e}")
+        rows = [
+            (c["serial_number"], c["name"], c["email"], c["title"], c["company"])
+            for c in test_contacts
+        ]
+        with cls.connection() as conn, conn.cursor() as cur:
+            try:
+                # Single multi-row UPSERT to reset status if contacts already exist
+                execute_values(
+                    cur,
+                    """INSERT INTO email_campaigns (serial_number, name, email, title, company, status, sent)
+                       VALUES %s
+                       ON CONFLICT (email) DO UPDATE SET 
+                           status = 'pending', 
+                           sent = FALSE,
+                           name = EXCLUDED.name,
+                           title = EXCLUDED.title,
+                           company = EXCLUDED.company,
+                           error_message = NULL,
+                           sent_at = NULL
+                       WHERE email_campaigns.status IS DISTINCT FROM 'pending'
+                          OR email_campaigns.sent IS DISTINCT FROM FALSE
+                          OR email_campaigns.name IS DISTINCT FROM EXCLUDED.name
+                          OR email_campaigns.title IS DISTINCT FROM EXCLUDED.title
+                          OR email_campaigns.company IS DISTINCT FROM EXCLUDED.company
+                          OR email_campaigns.error_message IS NOT NULL
+                          OR email_campaigns.sent_at IS NOT NULL""",
+                    rows,
+                    template="(%s, %s, %s, %s, %s, 'pending', FALSE)",
+                    page_size=100
+                )
+            except Exception as e:
+                print(f"Error adding test contacts: {e}")
     
     @classmethod
     def get_pending_emails_paginated(cls, offset: int = 0, limit: int = 10) -> List[Dict]:
         """Get pending emails with pagination, test emails (serial_number=0) first"""
-        conn = cls.get_connection()
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with cls.connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
             cur.execute(
                 """SELECT * FROM email_campaigns 
                    WHERE status = 'pending' AND sent = FALSE 
-                   ORDER BY serial_number ASC, id ASC 
+                   ORDER BY COALESCE(serial_number, 2147483647) ASC, id ASC 
                    LIMIT %s OFFSET %s""",
                 (limit, offset)
             )
@@ -294,26 +455,80 @@ class Database:
     @classmethod
     def get_email_by_id(cls, email_id: int) -> Optional[Dict]:
         """Get single email by ID"""
-        conn = cls.get_connection()
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with cls.connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
             cur.execute("SELECT * FROM email_campaigns WHERE id = %s", (email_id,))
             row = cur.fetchone()
             return dict(row) if row else None
 
+@st.cache_resource(show_spinner=False)
+def init_schema() -> bool:
+    """Bootstrap the schema once per server process (failures are retried next rerun)"""
+    # CREATE INDEX IF NOT EXISTS still takes a SHARE lock, so keep it off the rerun path
+    Database.init_tables()
+    # Nothing is sending yet in this process, so leftover claims are from a dead one
+    Database.fail_interrupted_sends()
+    return True
+
 # =============================================================================
 # GEMINI AI CLIENT
 # =============================================================================
 
+# Default email body; Gemini is only asked to lightly adapt this per company
+FALLBACK_TEMPLATE = """Hello,
+
+My name is {sender}, and I am a Full Stack Developer with hands-on experience in building and maintaining real-world software applications. I have built full-stack projects using React, Next.js, Node.js, Python, and databases like PostgreSQL and MongoDB.
+
+I enjoy learning quickly, solving problems, and delivering clean, reliable solutions. I believe my technical skills, practical experience, and strong work ethic make me a good fit for opportunities at {company}.
+
+Please find my resume attached for your reference.
+
+Thank you for your time and consideration.
+
+Best regards,
+{signature}"""
+
+# Short, structured output: capped tokens and a {subject, body} JSON schema
+GEMINI_GENERATION_CONFIG = {
+    "max_output_tokens": 300,
+    "temperature": 0.2,
+    "response_mime_type": "application/json",
+    "response_schema": {
+        "type": "object",
+        "properties": {
+            "subject": {"type": "string"},
+            "body": {"type": "string"}
+        },
+        "required": ["subject", "body"]
+    }
+}
+
 class GeminiClient:
     def __init__(self):
         if config.GEMINI_API_KEY:
             genai.configure(api_key=config.GEMINI_API_KEY)
-            self.model = genai.GenerativeModel("gemini-1.5-flash")
+            self.model = genai.GenerativeModel(
+                "gemini-1.5-flash",
+                generation_config=GEMINI_GENERATION_CONFIG
+            )
         else:
             self.model = None
+        
+        # Config is fixed for the process, so render everything but {company} once
+        self._signature = self.get_signature()
+        self._fallback_template = FALLBACK_TEMPLATE.format(
+            sender=self._escape(config.SENDER_NAME),
+            company="{company}",
+            signature=self._escape(self._signature)
+        )
     
-    def generate_email(self, hr_name: str, hr_title: str, company: str) -> Dict[str, str]:
-        """Generate personalized email using Gemini AI"""
+    @staticmethod
+    def _escape(value: str) -> str:
+        """Escape braces so a value survives a second str.format pass"""
+        return value.replace("{", "{{").replace("}", "}}")
+    
+    @staticmethod
+    def get_signature() -> str:
+        """Build the sender signature block"""
         signature_parts = []
         if config.SENDER_NAME:
             signature_parts.append(config.SENDER_NAME)
@@ -324,28 +539,30 @@ class GeminiClient:
         if config.GITHUB:
             signature_parts.append(f"GitHub: {config.GITHUB}")
         
-        signature = "\n".join(signature_parts)
-        
-        # Fallback email template (when Gemini is not available)
-        fallback_body = f"""Hello,
-
-My name is {config.SENDER_NAME}, and I am a Full Stack Developer with hands-on experience in building and maintaining real-world software applications. I have built full-stack projects using React, Next.js, Node.js, Python, and databases like PostgreSQL and MongoDB.
-
-I enjoy learning quickly, solving problems, and delivering clean, reliable solutions. I believe my technical skills, practical experience, and strong work ethic make me a good fit for opportunities at {company}.
-
-Please find my resume attached for your reference.
-
-Thank you for your time and consideration.
-
-Best regards,
-{signature}"""
+        return "\n".join(signature_parts)
+    
+    def generate_email(self, hr_name: str, hr_title: str, company: str) -> Dict[str, str]:
+        """Generate email from the template, personalized with Gemini AI if enabled"""
+        # Fallback email template (when Gemini is not available or not enabled)
+        fallback_body = self._fallback_template.format(company=company)
         
-        if not self.model:
+        if not self.model or not config.GEMINI_PERSONALIZE:
             return {
                 "subject": f"Application for Software Developer Role - {company}",
                 "body": fallback_body
             }
         
+        try:
+            return generate_ai_email(company)
+        except Exception as e:
+            return {
+                "subject": f"Software Developer Eager to Contribute at {company}",
+                "body": fallback_body
+            }
+    
+    def _generate_ai(self, company: str) -> Dict[str, str]:
+        """Ask Gemini for a company-adapted email (the prompt only varies by company)"""
+        signature = self._signature
         prompt = f"""
         Write a simple, direct job application email. Follow this exact style:
         
@@ -373,53 +590,81 @@ Best regards,
         - Keep it under 80 words
         - Simple and professional
         
-        OUTPUT FORMAT:
-        SUBJECT: Application for Software Developer Role - {company}
-        BODY:
-        Hello,
-
-        [Email body following the template]
-
-        Best regards,
-        {signature}
+        OUTPUT FORMAT (JSON):
+        "subject": "Application for Software Developer Role - {company}"
+        "body": "Hello,\n\n[Email body following the template]\n\nBest regards,\n{signature}"
         """
         
-        try:
-            response = self.model.generate_content(prompt)
-            text = response.text
-            
-            if "SUBJECT:" in text and "BODY:" in text:
-                subject_part = text.split("BODY:")[0]
-                body_part = text.split("BODY:")[1]
-                subject = subject_part.replace("SUBJECT:", "").strip()
-                body = body_part.strip()
-            else:
-                subject = f"Software Developer Eager to Contribute at {company}"
-                body = text
-            
-            return {"subject": subject, "body": body}
-        except Exception as e:
-            return {
-                "subject": f"Software Developer Eager to Contribute at {company}",
-                "body": fallback_body
-            }
+        # Errors propagate so failed calls are not cached
+        response = self.model.generate_content(prompt)
+        data = json.loads(response.text)
+        
+        return {"subject": data["subject"].strip(), "body": data["body"].strip()}
 
-# Initialize Gemini client
-gemini_client = GeminiClient()
+@st.cache_resource
+def get_gemini() -> GeminiClient:
+    """Get the Gemini client (once per server process)"""
+    return GeminiClient()
+
+@st.cache_data(ttl=86400, max_entries=1000, show_spinner=False)
+def generate_ai_email(company: str) -> Dict[str, str]:
+    """Gemini email for a company, cached for a day (failed calls raise and are not cached)"""
+    return get_gemini()._generate_ai(company)
 
 # =============================================================================
 # EMAIL SENDER
 # =============================================================================
 
+# Streamlit re-executes this file into a fresh module on every rerun, so sender
+# state lives in cached resources rather than class attributes or lru_caches
+
+@st.cache_resource
+def get_smtp_sessions() -> threading.local:
+    """One long-lived SMTP session per sending thread (once per server process)"""
+    return threading.local()
+
+@st.cache_resource
+def get_attachment_cache() -> Dict[str, tuple]:
+    """Latest decoded resume and encoded payload, each stored as (key, value)"""
+    return {}
+
 class EmailSender:
+    @staticmethod
+    def _load_resume(resume_id: int, uploaded_at: datetime) -> Optional[tuple]:
+        """Fetch and decode a stored resume (cached until the active resume changes)"""
+        cache = get_attachment_cache()
+        key = (resume_id, uploaded_at)
+        cached = cache.get("resume")
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        resume_data = Database.get_resume_by_id(resume_id)
+        if not resume_data:
+            return None
+        content = base64.b64decode(resume_data["content_base64"])
+        resume = (content, resume_data["filename"], resume_data["content_type"])
+        cache["resume"] = (key, resume)
+        return resume
+    
+    @staticmethod
+    def _encode_attachment(content: bytes) -> str:
+        """Base64-encode attachment bytes for transport (cached for repeat sends)"""
+        cache = get_attachment_cache()
+        cached = cache.get("payload")
+        if cached is not None and cached[0] == content:
+            return cached[1]
+        payload = MIMEApplication(content, _subtype="pdf").get_payload()
+        cache["payload"] = (content, payload)
+        return payload
+    
     @staticmethod
     def get_resume_attachment() -> Optional[tuple]:
         """Get resume from database or local file"""
-        # Try database first
-        resume_data = Database.get_active_resume()
-        if resume_data:
-            content = base64.b64decode(resume_data["content_base64"])
-            return (content, resume_data["filename"], resume_data["content_type"])
+        # Try database first; only the small (id, uploaded_at) key is fetched per send
+        resume_key = Database.get_active_resume_key()
+        if resume_key:
+            resume = EmailSender._load_resume(*resume_key)
+            if resume:
+                return resume
         
         # Fallback to local file
         if config.RESUME_PATH and os.path.exists(config.RESUME_PATH):
@@ -431,7 +676,34 @@ class EmailSender:
         return None
     
     @staticmethod
-    def send_email(to_email: str, subject: str, body: str) -> bool:
+    def _connect() -> smtplib.SMTP:
+        """Open and authenticate a new SMTP session"""
+        server = smtplib.SMTP(config.SMTP_SERVER, config.SMTP_PORT)
+        server.starttls()
+        server.login(config.SENDER_EMAIL, config.SENDER_PASSWORD)
+        return server
+    
+    @classmethod
+    def get_server(cls) -> smtplib.SMTP:
+        """Get this thread's SMTP session, reconnecting if it has gone stale"""
+        sessions = get_smtp_sessions()
+        server = getattr(sessions, "server", None)
+        if server is not None:
+            try:
+                # Cheap liveness probe instead of a full TCP + TLS + AUTH handshake
+                if server.noop()[0] == 250:
+                    return server
+            except (smtplib.SMTPServerDisconnected, ConnectionError):
+                pass
+            try:
+                server.close()
+            except Exception:
+                pass
+        sessions.server = cls._connect()
+        return sessions.server
+    
+    @classmethod
+    def send_email(cls, to_email: str, subject: str, body: str) -> bool:
         """Send email via SMTP"""
         msg = MIMEMultipart()
         msg["From"] = f"{config.SENDER_NAME} <{config.SENDER_EMAIL}>"
@@ -446,16 +718,22 @@ class EmailSender:
         resume = EmailSender.get_resume_attachment()
         if resume:
             content, filename, content_type = resume
-            attachment = MIMEApplication(content, _subtype="pdf")
+            # Reuse the base64 body encoded once per resume; only the envelope is rebuilt
+            attachment = MIMEBase("application", "pdf")
+            attachment.set_payload(EmailSender._encode_attachment(content))
+            attachment["Content-Transfer-Encoding"] = "base64"
             attachment.add_header("Content-Disposition", "attachment", filename=filename)
             msg.attach(attachment)
         
         try:
-            with smtplib.SMTP(config.SMTP_SERVER, config.SMTP_PORT) as server:
-                server.starttls()
-                server.login(config.SENDER_EMAIL, config.SENDER_PASSWORD)
+            try:
                 # Send to both recipient and BCC
-                server.send_message(msg)
+                cls.get_server().send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                # Dropped between the probe and the send; retry once on a fresh session
+                sessions = get_smtp_sessions()
+                sessions.server = cls._connect()
+                sessions.server.send_message(msg)
             return True
         except Exception as e:
             raise Exception(f"SMTP Error: {str(e)}")
@@ -475,29 +753,44 @@ class CampaignWorker:
                     cls._instance = super().__new__(cls)
                     cls._instance.is_running = False
                     cls._instance.is_paused = False
-                    cls._instance.current_email = None
-                    cls._instance.thread = None
+                    cls._instance.current_emails = {}  # Sender thread ident -> email in flight
+                    cls._instance.threads = []
+                    # Bumped by start(); senders from an earlier start exit when it changes
+                    cls._instance._generation = 0
+                    cls._instance._wake = threading.Event()
+                    cls._instance._delays = iter(())
+                    # Bumped on every state change the UI should show (see live_status)
+                    cls._instance._versions = itertools.count(1)
+                    cls._instance.state_version = 0
         return cls._instance
     
-    def process_emails(self):
+    def _changed(self):
+        """Publish a new state version for the UI to pick up"""
+        self.state_version = next(self._versions)
+    
+    def process_emails(self, generation: int):
         """Process emails in background thread"""
-        while self.is_running:
+        me = threading.get_ident()
+        while self.is_running and generation == self._generation:
             if self.is_paused:
-                time.sleep(1)
+                self._wake.wait(timeout=1.0)
+                self._wake.clear()
                 continue
             
+            email_record = None
             try:
-                emails = Database.get_pending_emails(limit=1)
-                if not emails:
-                    self.is_running = False
-                    self.current_email = None
+                email_record = Database.claim_next_pending()
+                if not email_record:
+                    if generation == self._generation:
+                        self.is_running = False
+                    self._changed()
                     break
                 
-                email_record = emails[0]
-                self.current_email = email_record["email"]
+                self.current_emails[me] = email_record["email"]
+                self._changed()
                 
                 # Generate personalized email
-                email_content = gemini_client.generate_email(
+                email_content = get_gemini().generate_email(
                     hr_name=email_record["name"],
                     hr_title=email_record.get("title") or "HR Manager",
                     company=email_record.get("company") or "your company"
@@ -513,171 +806,540 @@ class CampaignWorker:
                     Database.update_email_status(email_record["id"], "sent")
                 except Exception as e:
                     Database.update_email_status(email_record["id"], "failed", str(e))
+                email_record = None  # Outcome recorded
                 
-                self.current_email = None
+                self.current_emails.pop(me, None)
+                self._changed()
                 
                 # Random delay between emails
                 if self.is_running and not self.is_paused:
-                    delay = random.randint(config.MIN_DELAY, config.MAX_DELAY)
-                    for _ in range(delay):
-                        if not self.is_running or self.is_paused:
-                            break
-                        time.sleep(1)
+                    deadline = time.monotonic() + self._next_delay()
+                    # A wake only ends the delay early when it paused or stopped the worker;
+                    # a stale one (e.g. Pause then Resume mid-send) just re-enters the wait
+                    while self.is_running and not self.is_paused and (remaining := deadline - time.monotonic()) > 0:
+                        self._wake.wait(timeout=remaining)
+                        self._wake.clear()
                         
             except Exception as e:
                 print(f"Worker error: {e}")
+                if email_record:
+                    # Don't leave the claimed row stuck in 'sending'; it can be retried from Failed
+                    try:
+                        Database.update_email_status(email_record["id"], "failed", str(e))
+                    except Exception as update_error:
+                        print(f"Worker error: {update_error}")
+                    self.current_emails.pop(me, None)
+                    self._changed()
                 time.sleep(5)
         
-        self.current_email = None
+        self.current_emails.pop(me, None)
+    
+    def _refill_delays(self):
+        """Pre-sample a batch of inter-send delays in one vectorized call"""
+        rng = np.random.default_rng()
+        self._delays = iter(rng.integers(config.MIN_DELAY, config.MAX_DELAY + 1, size=1024).tolist())
+    
+    def _next_delay(self) -> int:
+        """Take the next delay from the schedule, refilling it when exhausted"""
+        delay = next(self._delays, None)
+        if delay is None:
+            self._refill_delays()
+            delay = next(self._delays, random.randint(config.MIN_DELAY, config.MAX_DELAY))
+        return delay
     
     def start(self):
         """Start the campaign worker"""
         if not self.is_running:
             self.is_running = True
             self.is_paused = False
-            self.thread = threading.Thread(target=self.process_emails, daemon=True)
-            self.thread.start()
+            self._wake.clear()
+            self._refill_delays()
+            # Senders still finishing a send from before a Stop see the new generation and exit
+            self._generation += 1
+            # Each sender claims its own rows and keeps its own delay budget
+            self.threads = [
+                threading.Thread(target=self.process_emails, args=(self._generation,), daemon=True)
+                for _ in range(max(1, config.SMTP_WORKERS))
+            ]
+            for thread in self.threads:
+                thread.start()
+            self._changed()
     
     def pause(self):
         """Pause the campaign"""
         self.is_paused = True
+        self._wake.set()
+        self._changed()
     
     def resume(self):
         """Resume the campaign"""
         self.is_paused = False
+        self._wake.set()
+        self._changed()
     
     def stop(self):
         """Stop the campaign"""
         self.is_running = False
         self.is_paused = False
-        self.current_email = None
+        self._wake.set()
+        self._changed()
+
+@st.cache_resource
+def get_worker() -> CampaignWorker:
+    """Get the campaign worker (once per server process)"""
+    return CampaignWorker()
 
 # Initialize worker singleton
-worker = CampaignWorker()
+worker = get_worker()
+
+def send_single_email(email: Dict) -> Dict[str, Any]:
+    """Generate, send and record one email (runs on the send pool)"""
+    # Claim first so the campaign worker or another session can't send it too
+    if not Database.claim_email(email["id"]):
+        return {"email": email["email"], "error": "already being sent"}
+    try:
+        email_content = get_gemini().generate_email(
+            hr_name=email["name"],
+            hr_title=email.get("title") or "HR Manager",
+            company=email.get("company") or "your company"
+        )
+        EmailSender.send_email(
+            to_email=email["email"],
+            subject=email_content["subject"],
+            body=email_content["body"]
+        )
+        Database.update_email_status(email["id"], "sent")
+        return {"email": email["email"], "error": None}
+    except Exception as e:
+        Database.update_email_status(email["id"], "failed", str(e))
+        return {"email": email["email"], "error": str(e)}
+
+@st.cache_resource
+def get_send_pool() -> ThreadPoolExecutor:
+    """Thread pool for manual sends so the UI never blocks on Gemini/SMTP"""
+    return ThreadPoolExecutor(max_workers=config.SEND_POOL_WORKERS, thread_name_prefix="custom-send")
+
+# =============================================================================
+# CACHED READS (short TTL so reruns don't hit Postgres every time)
+# =============================================================================
+
+@st.cache_data(ttl=5, max_entries=8, show_spinner=False)
+def _cached_stats() -> Dict:
+    """Campaign statistics, cached for a few seconds across reruns"""
+    return Database.get_status_counts()
+
+@st.cache_data(ttl=5, max_entries=32, show_spinner=False)
+def _cached_emails(status: str, test_only: Optional[bool] = None, search: Optional[str] = None,
+                   order_by: str = "serial_number", limit: int = 100, offset: int = 0,
+                   after: Optional[tuple] = None) -> List[Dict]:
+    """A filtered page of emails, cached for a few seconds across reruns"""
+    return Database.query_emails(
+        status, test_only=test_only, search=search, order_by=order_by, limit=limit, offset=offset,
+        after=after
+    )
+
+@st.cache_data(ttl=10, max_entries=32, show_spinner=False)
+def _cached_count(status: str, test_only: Optional[bool] = None, search: Optional[str] = None) -> int:
+    """Filtered email count for pagination, cached across reruns"""
+    return Database.count_emails(status, test_only, search)
+
+@st.cache_data(ttl=5, max_entries=32, show_spinner=False)
+def _emails_df(status: str, search: Optional[str] = None, limit: int = 100) -> pd.DataFrame:
+    """Display-ready DataFrame of emails, built once per cache entry"""
+    rows = Database.query_emails(status, search=search, order_by="updated_at", limit=limit)
+    df = pd.DataFrame.from_records(
+        rows, columns=["serial_number", "name", "email", "company", "title", "sent_at"]
+    )
+    df["company"] = df["company"].fillna("-")
+    df["title"] = df["title"].fillna("-")
+    df["sent_at"] = pd.to_datetime(df["sent_at"]).dt.strftime("%Y-%m-%d %H:%M").fillna("-")
+    return df.rename(columns={
+        "serial_number": "#",
+        "name": "Name",
+        "email": "Email",
+        "company": "Company",
+        "title": "Title",
+        "sent_at": "Sent At",
+    })
+
+def normalize_search(text: str) -> Optional[str]:
+    """Lowercase and trim a search box value once (None when empty)"""
+    # ILIKE ignores case anyway; this lets "Acme" and "acme " share one cache entry
+    text = (text or "").strip().lower()
+    return text or None
+
+def invalidate_cache():
+    """Drop cached reads after a mutation so the next rerun sees it"""
+    _cached_stats.clear()
+    _cached_emails.clear()
+    _cached_count.clear()
+    _emails_df.clear()
+    # This session is about to rerun anyway, so live_status needn't trigger another
+    st.session_state.seen_state_version = worker.state_version
 
 # =============================================================================
 # STREAMLIT UI
 # =============================================================================
 
-def main():
-    st.set_page_config(
-        page_title="Email Outreach Pro",
-        page_icon="📧",
-        layout="wide",
-        initial_sidebar_state="expanded"
+# Custom CSS for dark theme (module constant; re-emitted each rerun since
+# Streamlit drops elements a rerun does not render)
+APP_CSS = """
+<style>
+    /* Main app styling */
+    .stApp {
+        background: linear-gradient(135deg, #0f172a 0%, #1e293b 100%);
+    }
+    
+    /* Headers */
+    h1, h2, h3 {
+        color: #f8fafc !important;
+    }
+    
+    /* Metrics styling */
+    [data-testid="stMetricValue"] {
+        font-size: 2.5rem !important;
+        font-weight: 700 !important;
+    }
+    
+    /* Card-like containers */
+    .stMetric {
+        background: rgba(255, 255, 255, 0.05);
+        border: 1px solid rgba(255, 255, 255, 0.1);
+        border-radius: 1rem;
+        padding: 1rem;
+    }
+    
+    /* Buttons */
+    .stButton > button {
+        border-radius: 0.75rem;
+        padding: 0.5rem 1.5rem;
+        font-weight: 600;
+        transition: all 0.3s ease;
+    }
+    
+    /* View selector (horizontal st.radio) styled as tabs */
+    [data-testid="stRadio"] [role="radiogroup"] {
+        gap: 0.5rem;
+        background: rgba(255, 255, 255, 0.05);
+        border-radius: 1rem;
+        padding: 0.5rem;
+    }
+    
+    [data-testid="stRadio"] [role="radiogroup"] label {
+        border-radius: 0.75rem;
+        color: #94a3b8;
+        padding: 0.5rem 1rem;
+        margin: 0;
+    }
+    
+    [data-testid="stRadio"] [role="radiogroup"] label > div:first-child {
+        display: none;
+    }
+    
+    [data-testid="stRadio"] [role="radiogroup"] label:has(input:checked) {
+        background: rgba(59, 130, 246, 0.2);
+        color: white;
+    }
+    
+    /* Dataframe styling */
+    .stDataFrame {
+        border-radius: 1rem;
+        overflow: hidden;
+    }
+    
+    /* Sidebar */
+    [data-testid="stSidebar"] {
+        background: rgba(15, 23, 42, 0.95);
+        border-right: 1px solid rgba(255, 255, 255, 0.1);
+    }
+    
+    /* Progress bar */
+    .stProgress > div > div {
+        background: linear-gradient(90deg, #8b5cf6, #ec4899);
+        border-radius: 1rem;
+    }
+    
+    /* Custom status badge */
+    .status-badge {
+        display: inline-flex;
+        align-items: center;
+        gap: 0.5rem;
+        padding: 0.5rem 1rem;
+        border-radius: 2rem;
+        font-size: 0.875rem;
+        font-weight: 500;
+    }
+    
+    .status-running {
+        background: rgba(34, 197, 94, 0.2);
+        color: #4ade80;
+        border: 1px solid rgba(34, 197, 94, 0.3);
+    }
+    
+    .status-paused {
+        background: rgba(234, 179, 8, 0.2);
+        color: #facc15;
+        border: 1px solid rgba(234, 179, 8, 0.3);
+    }
+    
+    .status-stopped {
+        background: rgba(100, 116, 139, 0.2);
+        color: #94a3b8;
+        border: 1px solid rgba(100, 116, 139, 0.3);
+    }
+</style>
+"""
+
+@st.fragment(run_every=2)
+def live_status():
+    """Status badge that also reruns the page only when something actually changed"""
+    badge = st.empty()
+    if worker.is_running:
+        if worker.is_paused:
+            badge.markdown('<div class="status-badge status-paused">⏸️ Paused</div>', unsafe_allow_html=True)
+        else:
+            badge.markdown('<div class="status-badge status-running">🟢 Running</div>', unsafe_allow_html=True)
+    else:
+        badge.markdown('<div class="status-badge status-stopped">⚪ Stopped</div>', unsafe_allow_html=True)
+    
+    # Cheap in-memory checks; the full page (and its queries) reruns only on change
+    seen = st.session_state.setdefault("seen_state_version", worker.state_version)
+    sends_done = any(f.done() for f in st.session_state.get("inflight_sends", {}).values())
+    if worker.state_version != seen or sends_done:
+        invalidate_cache()
+        st.rerun()
+
+@st.fragment
+def custom_send_tab():
+    """Custom Send tab: manual, paginated one-by-one sending"""
+    st.markdown("### 🎯 Custom Send - Manual Email Control")
+    st.markdown("*Send emails one by one with full control.*")
+    
+    # Add Test Data Button & Filter
+    col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
+    with col1:
+        if st.button("➕ Add Test Contacts", type="secondary"):
+            Database.add_test_contacts()
+            invalidate_cache()
+            st.success("✅ Test contacts added!")
+            st.rerun()
+    with col2:
+        if st.button("🔄 Refresh List"):
+            invalidate_cache()
+            st.rerun()
+    
+    # Filter options
+    st.divider()
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        filter_option = st.selectbox(
+            "🔍 Filter",
+            ["All Pending", "🧪 Test Only", "📋 Regular Only"],
+            index=0,
+            key="filter_custom_send"
+        )
+    with col2:
+        search_query = st.text_input("🔎 Search", placeholder="Search by name, email, or company...", key="search_custom_send")
+    
+    st.divider()
+    
+    inflight = st.session_state.setdefault("inflight_sends", {})
+    
+    # Filter, search, order and page in SQL
+    test_only = {"🧪 Test Only": True, "📋 Regular Only": False}.get(filter_option)
+    search = normalize_search(search_query)
+    
+    # Keyset pagination: a stack of (serial_number, id) cursors, one per page already passed
+    filters = (test_only, search)
+    if st.session_state.get("custom_send_filters") != filters:
+        st.session_state.custom_send_filters = filters
+        st.session_state.custom_send_cursors = []
+    cursors = st.session_state.custom_send_cursors
+    
+    # Pagination
+    page_size = 10
+    total_filtered = _cached_count("pending", test_only, search)
+    total_pages = max(1, (total_filtered + page_size - 1) // page_size)
+    
+    # Reset page if out of bounds
+    if len(cursors) >= total_pages:
+        cursors.clear()
+    
+    emails_page = _cached_emails(
+        "pending", test_only, search, limit=page_size, after=cursors[-1] if cursors else None
     )
+    if not emails_page and cursors:
+        # Rows behind the cursor were sent meanwhile; fall back to the first page
+        cursors.clear()
+        emails_page = _cached_emails("pending", test_only, search, limit=page_size)
     
-    # Custom CSS for dark theme
-    st.markdown("""
-    <style>
-        /* Main app styling */
-        .stApp {
-            background: linear-gradient(135deg, #0f172a 0%, #1e293b 100%);
-        }
+    page = len(cursors)
+    offset = page * page_size
+    
+    if emails_page:
+        # Count test vs regular
+        if test_only is None:
+            test_count = _cached_count("pending", True, search)
+        else:
+            test_count = total_filtered if test_only else 0
+        regular_count = total_filtered - test_count
         
-        /* Headers */
-        h1, h2, h3 {
-            color: #f8fafc !important;
-        }
+        st.markdown(f"**Showing {offset + 1}-{min(offset + len(emails_page), total_filtered)} of {total_filtered}** | 🧪 Test: {test_count} | 📋 Regular: {regular_count}")
         
-        /* Metrics styling */
-        [data-testid="stMetricValue"] {
-            font-size: 2.5rem !important;
-            font-weight: 700 !important;
-        }
+        # Display each email with send button
+        for email in emails_page:
+            is_test = email['serial_number'] == 0
+            badge = "🧪 TEST" if is_test else f"#{email['serial_number']}"
+            bg_color = "rgba(139, 92, 246, 0.1)" if is_test else "transparent"
+            
+            with st.container():
+                col1, col2, col3 = st.columns([3, 2, 1])
+                
+                with col1:
+                    st.markdown(f"**{badge}** | {email['name']}")
+                    st.markdown(f"📧 {email['email']}")
+                
+                with col2:
+                    st.markdown(f"🏢 {email.get('company') or '-'}")
+                    st.markdown(f"💼 {email.get('title') or '-'}")
+                
+                with col3:
+                    future = inflight.get(email["id"])
+                    if future is not None:
+                        st.markdown('<div class="status-badge status-running">⏳ Sending</div>', unsafe_allow_html=True)
+                    elif st.button("📤 Send", key=f"send_{email['id']}", type="primary"):
+                        inflight[email["id"]] = get_send_pool().submit(send_single_email, email)
+                        st.rerun()
+                
+                st.divider()
         
-        /* Card-like containers */
-        .stMetric {
-            background: rgba(255, 255, 255, 0.05);
-            border: 1px solid rgba(255, 255, 255, 0.1);
-            border-radius: 1rem;
-            padding: 1rem;
-        }
+        # Pagination controls
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            if st.button("⬅️ Previous", disabled=page == 0):
+                cursors.pop()
+                st.rerun(scope="fragment")
+        with col2:
+            st.markdown(f"<div style='text-align: center;'>Page {page + 1} of {total_pages}</div>", unsafe_allow_html=True)
+        with col3:
+            if st.button("Next ➡️", disabled=page >= total_pages - 1):
+                last = emails_page[-1]
+                cursors.append((last["serial_number"], last["id"]))
+                st.rerun(scope="fragment")
+    else:
+        st.info("🎉 No pending emails to send!")
+
+@st.fragment
+def pending_tab(stats: Dict):
+    """Pending tab: searchable queue of contacts"""
+    st.markdown("### ⏳ Pending Emails")
+    
+    if stats["pending"]:
+        # Search filter
+        search = normalize_search(st.text_input("🔍 Search", placeholder="Filter by name, email, or company..."))
         
-        /* Buttons */
-        .stButton > button {
-            border-radius: 0.75rem;
-            padding: 0.5rem 1.5rem;
-            font-weight: 600;
-            transition: all 0.3s ease;
-        }
+        total_filtered = _cached_count("pending", search=search)
+        df = _emails_df("pending", search)
         
-        /* Tab styling */
-        .stTabs [data-baseweb="tab-list"] {
-            gap: 0.5rem;
-            background: rgba(255, 255, 255, 0.05);
-            border-radius: 1rem;
-            padding: 0.5rem;
-        }
+        st.markdown(f"**{total_filtered}** contacts in queue")
         
-        .stTabs [data-baseweb="tab"] {
-            border-radius: 0.75rem;
-            color: #94a3b8;
-            padding: 0.5rem 1rem;
-        }
+        # Display as dataframe
+        st.dataframe(df[["#", "Name", "Email", "Company", "Title"]], use_container_width=True, hide_index=True)
         
-        .stTabs [aria-selected="true"] {
-            background: rgba(59, 130, 246, 0.2);
-            color: white;
-        }
+        if total_filtered > 100:
+            st.info(f"Showing first 100 of {total_filtered} contacts")
+    else:
+        st.info("🎉 No pending emails! All contacts have been processed.")
+
+@st.fragment
+def sent_tab(stats: Dict):
+    """Sent tab: searchable list of sent emails"""
+    st.markdown("### ✅ Sent Emails")
+    
+    if stats["sent"]:
+        search = normalize_search(st.text_input("🔍 Search sent", placeholder="Filter by name, email, or company...", key="sent_search"))
         
-        /* Dataframe styling */
-        .stDataFrame {
-            border-radius: 1rem;
-            overflow: hidden;
-        }
+        total_filtered = _cached_count("sent", search=search)
+        df = _emails_df("sent", search)
         
-        /* Sidebar */
-        [data-testid="stSidebar"] {
-            background: rgba(15, 23, 42, 0.95);
-            border-right: 1px solid rgba(255, 255, 255, 0.1);
-        }
+        st.markdown(f"**{total_filtered}** emails sent successfully")
         
-        /* Progress bar */
-        .stProgress > div > div {
-            background: linear-gradient(90deg, #8b5cf6, #ec4899);
-            border-radius: 1rem;
-        }
+        st.dataframe(df[["#", "Name", "Email", "Company", "Sent At"]], use_container_width=True, hide_index=True)
         
-        /* Custom status badge */
-        .status-badge {
-            display: inline-flex;
-            align-items: center;
-            gap: 0.5rem;
-            padding: 0.5rem 1rem;
-            border-radius: 2rem;
-            font-size: 0.875rem;
-            font-weight: 500;
-        }
+        if total_filtered > 100:
+            st.info(f"Showing first 100 of {total_filtered} contacts")
+    else:
+        st.info("📭 No emails sent yet. Start the campaign to begin sending.")
+
+@st.fragment
+def failed_tab(stats: Dict):
+    """Failed tab: errors with per-email and bulk retry"""
+    st.markdown("### ❌ Failed Emails")
+    
+    if stats["failed"]:
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            search = normalize_search(st.text_input("🔍 Search failed", placeholder="Filter by name, email, or company...", key="failed_search"))
+        with col2:
+            if st.button("🔄 Retry All Failed", type="primary"):
+                Database.reset_all_failed()
+                invalidate_cache()
+                st.success("All failed emails reset to pending!")
+                st.rerun()
         
-        .status-running {
-            background: rgba(34, 197, 94, 0.2);
-            color: #4ade80;
-            border: 1px solid rgba(34, 197, 94, 0.3);
-        }
+        total_filtered = _cached_count("failed", search=search)
+        filtered = _cached_emails("failed", search=search, order_by="updated_at", limit=50)
         
-        .status-paused {
-            background: rgba(234, 179, 8, 0.2);
-            color: #facc15;
-            border: 1px solid rgba(234, 179, 8, 0.3);
-        }
+        st.markdown(f"**{total_filtered}** emails failed")
         
-        .status-stopped {
-            background: rgba(100, 116, 139, 0.2);
-            color: #94a3b8;
-            border: 1px solid rgba(100, 116, 139, 0.3);
-        }
-    </style>
-    """, unsafe_allow_html=True)
+        for email in filtered:
+            with st.expander(f"❌ {email['name']} - {email['email']}"):
+                st.markdown(f"**Company:** {email.get('company') or '-'}")
+                st.markdown(f"**Error:** {email.get('error_message') or 'Unknown error'}")
+                if st.button(f"🔄 Retry", key=f"retry_{email['id']}"):
+                    Database.reset_email_status(email['id'])
+                    invalidate_cache()
+                    st.success("Email reset to pending!")
+                    st.rerun()
+        
+        if total_filtered > 50:
+            st.info(f"Showing first 50 of {total_filtered} failed emails")
+    else:
+        st.success("🎉 No failed emails!")
+
+def main():
+    st.set_page_config(
+        page_title="Email Outreach Pro",
+        page_icon="📧",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
     
-    # Initialize database
+    # Custom CSS for dark theme
+    st.markdown(APP_CSS, unsafe_allow_html=True)
+    
+    # Initialize database (once per server process)
     try:
-        Database.init_tables()
+        init_schema()
     except Exception as e:
         st.error(f"❌ Database connection failed: {e}")
         st.info("Please check your DATABASE_URL in .env file")
         st.stop()
     
+    # Collect finished manual sends before live_status checks for them
+    inflight = st.session_state.setdefault("inflight_sends", {})
+    finished_sends = []
+    for email_id, future in list(inflight.items()):
+        if future.done():
+            del inflight[email_id]
+            try:
+                finished_sends.append(future.result())
+            except Exception as e:
+                # send_single_email's own failure path raised (e.g. DB down while recording)
+                finished_sends.append({"email": None, "error": str(e)})
+    if finished_sends:
+        invalidate_cache()
+    
     # Header
     col1, col2 = st.columns([3, 1])
     with col1:
@@ -685,19 +1347,16 @@ def main():
         st.markdown("*AI-Powered Campaign Management*")
     
     with col2:
-        # Status indicator
-        if worker.is_running:
-            if worker.is_paused:
-                st.markdown('<div class="status-badge status-paused">⏸️ Paused</div>', unsafe_allow_html=True)
-            else:
-                st.markdown('<div class="status-badge status-running">🟢 Running</div>', unsafe_allow_html=True)
-        else:
-            st.markdown('<div class="status-badge status-stopped">⚪ Stopped</div>', unsafe_allow_html=True)
+        # Status indicator (refreshes itself; reruns the page on worker changes)
+        live_status()
     
     st.divider()
     
-    # Get stats
-    stats = Database.get_stats()
+    # Get stats and the metrics derived from them
+    stats = _cached_stats()
+    progress = stats['sent'] / max(stats['total'], 1)
+    success_rate = stats['sent'] / max(stats['sent'] + stats['failed'], 1) * 100
+    est_hours = (stats['pending'] * 20) / 60  # ~20 min per email average
     
     # Sidebar - Campaign Controls
     with st.sidebar:
@@ -707,32 +1366,39 @@ def main():
         if not worker.is_running:
             if st.button("▶️ Start Campaign", type="primary", use_container_width=True, disabled=stats["pending"] == 0):
                 worker.start()
+                invalidate_cache()
                 st.rerun()
         else:
             if worker.is_paused:
                 if st.button("▶️ Resume", type="primary", use_container_width=True):
                     worker.resume()
+                    invalidate_cache()
                     st.rerun()
             else:
                 if st.button("⏸️ Pause", use_container_width=True):
                     worker.pause()
+                    invalidate_cache()
                     st.rerun()
             
             if st.button("⏹️ Stop Campaign", use_container_width=True):
                 worker.stop()
+                invalidate_cache()
                 st.rerun()
         
         st.divider()
         
         if st.button("🔄 Refresh Data", use_container_width=True):
+            invalidate_cache()
             st.rerun()
         
         st.divider()
         
         # Current email being processed
-        if worker.current_email:
+        sending = list(worker.current_emails.values())
+        if sending:
             st.markdown("### 📤 Currently Sending")
-            st.info(worker.current_email)
+            for email in sending:
+                st.info(email)
         
         st.divider()
         
@@ -742,11 +1408,20 @@ def main():
         st.markdown(f"**Email:** {config.SENDER_EMAIL}")
         st.markdown(f"**Delay:** {config.MIN_DELAY//60}-{config.MAX_DELAY//60} min")
     
+    # Report manual sends that finished since the last rerun (whichever view is open)
+    for result in finished_sends:
+        if result["error"]:
+            st.error(f"❌ Failed: {result['error']}")
+        else:
+            st.success(f"✅ Sent to {result['email']}")
+    
     # Main content
-    tabs = st.tabs(["📊 Dashboard", "🎯 Custom Send", "⏳ Pending", "✅ Sent", "❌ Failed"])
+    # Unlike st.tabs, only the selected view's body (and its queries) runs each rerun
+    views = ["📊 Dashboard", "🎯 Custom Send", "⏳ Pending", "✅ Sent", "❌ Failed"]
+    active = st.radio("View", views, horizontal=True, label_visibility="collapsed", key="active_tab")
     
     # Dashboard Tab
-    with tabs[0]:
+    if active == views[0]:
         # Stats cards
         col1, col2, col3, col4 = st.columns(4)
         
@@ -761,7 +1436,7 @@ def main():
             st.metric(
                 label="✅ Sent",
                 value=f"{stats['sent']:,}",
-                delta=f"{(stats['sent']/max(stats['total'],1)*100):.1f}%",
+                delta=f"{progress*100:.1f}%",
                 help="Successfully sent emails"
             )
         
@@ -788,263 +1463,40 @@ def main():
         
         with col1:
             st.markdown("### 📈 Campaign Progress")
-            progress = stats['sent'] / max(stats['total'], 1)
             st.progress(progress)
             
             col_a, col_b, col_c = st.columns(3)
             with col_a:
                 st.markdown(f"**Progress:** {progress*100:.1f}%")
             with col_b:
-                success_rate = stats['sent'] / max(stats['sent'] + stats['failed'], 1) * 100
                 st.markdown(f"**Success Rate:** {success_rate:.1f}%")
             with col_c:
-                est_hours = (stats['pending'] * 20) / 60  # ~20 min per email average
                 st.markdown(f"**Est. Time:** ~{est_hours:.1f}h")
         
         with col2:
             st.markdown("### 📊 Quick Stats")
             st.markdown(f"🎯 **Success Rate:** {success_rate:.1f}%")
-            st.markdown(f"⏱️ **Avg Delay:** {(config.MIN_DELAY + config.MAX_DELAY) // 2 // 60} min")
-            st.markdown(f"🤖 **AI Generated:** {stats['sent']}")
+            st.markdown(f"⏱️ **Avg Delay:** {AVG_DELAY_MIN} min")
+            if config.GEMINI_PERSONALIZE:
+                st.markdown(f"🤖 **AI Generated:** {stats['sent']}")
+            else:
+                st.markdown(f"📤 **Sent:** {stats['sent']}")
     
     # Custom Send Tab
-    with tabs[1]:
-        st.markdown("### 🎯 Custom Send - Manual Email Control")
-        st.markdown("*Send emails one by one with full control.*")
-        
-        # Add Test Data Button & Filter
-        col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
-        with col1:
-            if st.button("➕ Add Test Contacts", type="secondary"):
-                Database.add_test_contacts()
-                st.success("✅ Test contacts added!")
-                st.rerun()
-        with col2:
-            if st.button("🔄 Refresh List"):
-                st.rerun()
-        
-        # Filter options
-        st.divider()
-        col1, col2 = st.columns([1, 3])
-        with col1:
-            filter_option = st.selectbox(
-                "🔍 Filter",
-                ["All Pending", "🧪 Test Only", "📋 Regular Only"],
-                index=0,
-                key="filter_custom_send"
-            )
-        with col2:
-            search_query = st.text_input("🔎 Search", placeholder="Search by name, email, or company...", key="search_custom_send")
-        
-        st.divider()
-        
-        # Pagination
-        if 'custom_send_page' not in st.session_state:
-            st.session_state.custom_send_page = 0
-        
-        # Get all pending emails first, then filter
-        all_pending = Database.get_emails_by_status("pending")
-        
-        # Apply filter
-        if filter_option == "🧪 Test Only":
-            filtered_emails = [e for e in all_pending if e['serial_number'] == 0]
-        elif filter_option == "📋 Regular Only":
-            filtered_emails = [e for e in all_pending if e['serial_number'] != 0]
-        else:
-            # Sort: test emails (serial_number=0) first, then by serial_number
-            filtered_emails = sorted(all_pending, key=lambda x: (0 if x['serial_number'] == 0 else 1, x['serial_number']))
-        
-        # Apply search
-        if search_query:
-            search_lower = search_query.lower()
-            filtered_emails = [e for e in filtered_emails if 
-                             search_lower in e['name'].lower() or 
-                             search_lower in e['email'].lower() or 
-                             search_lower in (e.get('company') or '').lower()]
-        
-        # Pagination
-        page_size = 10
-        total_filtered = len(filtered_emails)
-        total_pages = max(1, (total_filtered + page_size - 1) // page_size)
-        
-        # Reset page if out of bounds
-        if st.session_state.custom_send_page >= total_pages:
-            st.session_state.custom_send_page = 0
-        
-        offset = st.session_state.custom_send_page * page_size
-        emails_page = filtered_emails[offset:offset + page_size]
-        
-        if emails_page:
-            # Count test vs regular
-            test_count = len([e for e in filtered_emails if e['serial_number'] == 0])
-            regular_count = total_filtered - test_count
-            
-            st.markdown(f"**Showing {offset + 1}-{min(offset + len(emails_page), total_filtered)} of {total_filtered}** | 🧪 Test: {test_count} | 📋 Regular: {regular_count}")
-            
-            # Display each email with send button
-            for email in emails_page:
-                is_test = email['serial_number'] == 0
-                badge = "🧪 TEST" if is_test else f"#{email['serial_number']}"
-                bg_color = "rgba(139, 92, 246, 0.1)" if is_test else "transparent"
-                
-                with st.container():
-                    col1, col2, col3 = st.columns([3, 2, 1])
-                    
-                    with col1:
-                        st.markdown(f"**{badge}** | {email['name']}")
-                        st.markdown(f"📧 {email['email']}")
-                    
-                    with col2:
-                        st.markdown(f"🏢 {email.get('company') or '-'}")
-                        st.markdown(f"💼 {email.get('title') or '-'}")
-                    
-                    with col3:
-                        if st.button("📤 Send", key=f"send_{email['id']}", type="primary"):
-                            with st.spinner(f"Sending to {email['email']}..."):
-                                try:
-                                    # Generate email
-                                    email_content = gemini_client.generate_email(
-                                        hr_name=email["name"],
-                                        hr_title=email.get("title") or "HR Manager",
-                                        company=email.get("company") or "your company"
-                                    )
-                                    # Send email
-                                    EmailSender.send_email(
-                                        to_email=email["email"],
-                                        subject=email_content["subject"],
-                                        body=email_content["body"]
-                                    )
-                                    Database.update_email_status(email["id"], "sent")
-                                    st.success(f"✅ Sent to {email['email']}")
-                                    time.sleep(1)
-                                    st.rerun()
-                                except Exception as e:
-                                    Database.update_email_status(email["id"], "failed", str(e))
-                                    st.error(f"❌ Failed: {str(e)}")
-                    
-                    st.divider()
-            
-            # Pagination controls
-            col1, col2, col3 = st.columns([1, 2, 1])
-            with col1:
-                if st.button("⬅️ Previous", disabled=st.session_state.custom_send_page == 0):
-                    st.session_state.custom_send_page -= 1
-                    st.rerun()
-            with col2:
-                st.markdown(f"<div style='text-align: center;'>Page {st.session_state.custom_send_page + 1} of {total_pages}</div>", unsafe_allow_html=True)
-            with col3:
-                if st.button("Next ➡️", disabled=st.session_state.custom_send_page >= total_pages - 1):
-                    st.session_state.custom_send_page += 1
-                    st.rerun()
-        else:
-            st.info("🎉 No pending emails to send!")
+    if active == views[1]:
+        custom_send_tab()
     
     # Pending Tab
-    with tabs[2]:
-        st.markdown("### ⏳ Pending Emails")
-        pending_emails = Database.get_emails_by_status("pending")
-        
-        if pending_emails:
-            # Search filter
-            search = st.text_input("🔍 Search", placeholder="Filter by name, email, or company...")
-            
-            filtered = pending_emails
-            if search:
-                search_lower = search.lower()
-                filtered = [e for e in pending_emails if 
-                           search_lower in e['name'].lower() or 
-                           search_lower in e['email'].lower() or 
-                           search_lower in (e.get('company') or '').lower()]
-            
-            st.markdown(f"**{len(filtered)}** contacts in queue")
-            
-            # Display as dataframe
-            df_data = [{
-                "#": e['serial_number'],
-                "Name": e['name'],
-                "Email": e['email'],
-                "Company": e.get('company') or '-',
-                "Title": e.get('title') or '-'
-            } for e in filtered[:100]]
-            
-            st.dataframe(df_data, use_container_width=True, hide_index=True)
-            
-            if len(filtered) > 100:
-                st.info(f"Showing first 100 of {len(filtered)} contacts")
-        else:
-            st.info("🎉 No pending emails! All contacts have been processed.")
+    if active == views[2]:
+        pending_tab(stats)
     
     # Sent Tab
-    with tabs[3]:
-        st.markdown("### ✅ Sent Emails")
-        sent_emails = Database.get_emails_by_status("sent")
-        
-        if sent_emails:
-            search = st.text_input("🔍 Search sent", placeholder="Filter by name, email, or company...", key="sent_search")
-            
-            filtered = sent_emails
-            if search:
-                search_lower = search.lower()
-                filtered = [e for e in sent_emails if 
-                           search_lower in e['name'].lower() or 
-                           search_lower in e['email'].lower() or 
-                           search_lower in (e.get('company') or '').lower()]
-            
-            st.markdown(f"**{len(filtered)}** emails sent successfully")
-            
-            df_data = [{
-                "#": e['serial_number'],
-                "Name": e['name'],
-                "Email": e['email'],
-                "Company": e.get('company') or '-',
-                "Sent At": e['sent_at'].strftime("%Y-%m-%d %H:%M") if e.get('sent_at') else '-'
-            } for e in filtered[:100]]
-            
-            st.dataframe(df_data, use_container_width=True, hide_index=True)
-            
-            if len(filtered) > 100:
-                st.info(f"Showing first 100 of {len(filtered)} contacts")
-        else:
-            st.info("📭 No emails sent yet. Start the campaign to begin sending.")
+    if active == views[3]:
+        sent_tab(stats)
     
     # Failed Tab
-    with tabs[4]:
-        st.markdown("### ❌ Failed Emails")
-        failed_emails = Database.get_emails_by_status("failed")
-        
-        if failed_emails:
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                search = st.text_input("🔍 Search failed", placeholder="Filter by name, email, or company...", key="failed_search")
-            with col2:
-                if st.button("🔄 Retry All Failed", type="primary"):
-                    Database.reset_all_failed()
-                    st.success("All failed emails reset to pending!")
-                    st.rerun()
-            
-            filtered = failed_emails
-            if search:
-                search_lower = search.lower()
-                filtered = [e for e in failed_emails if 
-                           search_lower in e['name'].lower() or 
-                           search_lower in e['email'].lower() or 
-                           search_lower in (e.get('company') or '').lower()]
-            
-            st.markdown(f"**{len(filtered)}** emails failed")
-            
-            for email in filtered[:50]:
-                with st.expander(f"❌ {email['name']} - {email['email']}"):
-                    st.markdown(f"**Company:** {email.get('company') or '-'}")
-                    st.markdown(f"**Error:** {email.get('error_message') or 'Unknown error'}")
-                    if st.button(f"🔄 Retry", key=f"retry_{email['id']}"):
-                        Database.reset_email_status(email['id'])
-                        st.success("Email reset to pending!")
-                        st.rerun()
-            
-            if len(filtered) > 50:
-                st.info(f"Showing first 50 of {len(filtered)} failed emails")
-        else:
-            st.success("🎉 No failed emails!")
+    if active == views[4]:
+        failed_tab(stats)
     
     # Footer
     st.divider()
@@ -1054,11 +1506,6 @@ def main():
         "</div>",
         unsafe_allow_html=True
     )
-    
-    # Auto-refresh when campaign is running
-    if worker.is_running and not worker.is_paused:
-        time.sleep(5)
-        st.rerun()
 
 if __name__ == "__main__":
     main()
@@ -1,5 +1,4 @@
 import psycopg2
-from psycopg2.extras import RealDictCursor
 from dotenv import load_dotenv
 import os
 
@@ -7,15 +6,29 @@ load_dotenv()
 
 conn = psycopg2.connect(os.getenv('DATABASE_URL'))
 conn.autocommit = True
-cur = conn.cursor(cursor_factory=RealDictCursor)
+cur = conn.cursor()
 
-# Check test contacts
+# Test contacts, pending count and first 5 pending in one round-trip
 cur.execute("""
-    SELECT serial_number, name, email, company, title, status 
-    FROM email_campaigns 
-    WHERE serial_number = 0 OR email LIKE '%chiragj2019%'
+    WITH tests AS (
+        SELECT serial_number, name, email, company, title, status 
+        FROM email_campaigns 
+        WHERE serial_number = 0 OR email LIKE '%chiragj2019%'
+    ),
+    first5 AS (
+        SELECT serial_number, name, email 
+        FROM email_campaigns 
+        WHERE status = 'pending' 
+        LIMIT 5
+    )
+    SELECT json_build_object(
+        'tests', COALESCE((SELECT json_agg(t) FROM tests t), '[]'::json),
+        'pending_count', (SELECT COUNT(*) FROM email_campaigns WHERE status = 'pending'),
+        'first5', COALESCE((SELECT json_agg(f) FROM first5 f), '[]'::json)
+    )
 """)
-rows = cur.fetchall()
+result = cur.fetchone()[0]
+rows = result['tests']
 
 print("=" * 80)
 print("TEST CONTACTS IN DATABASE:")
@@ -28,13 +41,10 @@ if rows:
 else:
     print("NO TEST CONTACTS FOUND!")
     print("\nLet's check all pending emails:")
-    cur.execute("SELECT COUNT(*) as cnt FROM email_campaigns WHERE status = 'pending'")
-    cnt = cur.fetchone()
-    print(f"Pending emails: {cnt['cnt']}")
+    print(f"Pending emails: {result['pending_count']}")
     
     # Show first 5 pending
-    cur.execute("SELECT serial_number, name, email FROM email_campaigns WHERE status = 'pending' LIMIT 5")
-    for r in cur.fetchall():
+    for r in result['first5']:
         print(f"  SN: {r['serial_number']} | {r['name']} | {r['email']}")
 
 cur.close()